@@ -9,12 +9,17 @@ Purpose: Generate realistic E2 traffic to test xApp metrics
 
 import json
 import time
-import random
 import logging
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
+import signal
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 # Configure logging
 logging.basicConfig(
@@ -24,11 +29,21 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def calculate_qoe_score(packet_loss: float, latency: float, jitter: float) -> float:
+    """Calculate QoE score (0-100) for a single UE"""
+    qoe_score = 100.0
+    qoe_score -= packet_loss * 5.0  # Penalize packet loss
+    qoe_score -= max(0.0, (latency - 50.0) / 2.0)  # Penalize high latency
+    qoe_score -= jitter * 2.0  # Penalize jitter
+    return max(0.0, min(100.0, qoe_score))
+
+
 class E2Simulator:
     """Simulates E2 Node sending indications to xApps"""
 
     def __init__(self):
         self.running = False
+        self._stop = threading.Event()
         self.config = {
             'xapps': {
                 'kpimon': {
@@ -55,7 +70,12 @@ class E2Simulator:
             'cells': ['cell_001', 'cell_002', 'cell_003'],
             'ues': list(range(1, 21)),  # 20 UEs
             'beams_per_cell': 8,  # Number of beams per cell (SSB Index: 0-7)
-            'interval': 5  # Send indications every 5 seconds
+            'interval': 5,  # Send indications every 5 seconds
+            'seed': None,  # Set an int for reproducible simulated traffic
+            'batch_mode': False,  # POST indications in batches to <endpoint>/batch
+            'batch_size': 4,  # Indications per batch (batch mode only)
+            'breaker_threshold': 3,  # Consecutive failures before an xApp is skipped
+            'breaker_cooldown': 30  # Seconds to skip a failing xApp before retrying
         }
 
         # Beam configurations per cell (SSB Index represents beamforming direction)
@@ -66,71 +86,182 @@ class E2Simulator:
             'cell_003': list(range(8))
         }
 
-    def generate_kpi_indication(self) -> Dict:
-        """Generate E2SM-KPM indication with realistic KPI values including beam_id"""
-        cell_id = random.choice(self.config['cells'])
-        ue_id = f"ue_{random.choice(self.config['ues']):03d}"
+        # Cells and UE identifiers never change, so build them once
+        self._cells = tuple(self.config['cells'])
+        self._n_cells = len(self._cells)
+        self._ue_ids = tuple(f"ue_{ue:03d}" for ue in self.config['ues'])
+        self._n_ues = len(self._ue_ids)
+        self._control_event_types = ('load_balancing', 'interference_mitigation', 'power_control')
+
+        # Single PCG64 random source for all simulated values
+        self._rng = np.random.default_rng(self.config['seed'])
+
+        # Pre-drawn uniform floats for scalar draws (event gates, index picks),
+        # refilled in bulk when exhausted
+        self._random_buf = self._rng.random(size=4096).tolist()
+        self._random_idx = 0
+
+        # KPI measurement ranges (name, low, high)
+        kpi_ranges = (
+            ('DRB.PacketLossDl', 0.1, 5.0),       # 0.1% - 5%
+            ('DRB.PacketLossUl', 0.1, 5.0),
+            ('DRB.UEThpDl', 10.0, 100.0),         # 10-100 Mbps
+            ('DRB.UEThpUl', 5.0, 50.0),           # 5-50 Mbps
+            ('RRU.PrbUsedDl', 30.0, 85.0),        # 30-85% PRB usage
+            ('RRU.PrbUsedUl', 20.0, 70.0),
+            ('UE.RSRP', -120.0, -80.0),           # -120 to -80 dBm (legacy, cell-level)
+            ('UE.RSRQ', -15.0, -5.0),             # -15 to -5 dB
+            ('UE.SINR', 5.0, 25.0),               # 5-25 dB
+            ('RRC.ConnEstabSucc', 95.0, 99.9)     # 95-99.9% success rate
+        )
+        # Serving-beam L1-RSRP and L1-SINR ranges (better than cell-level values)
+        # are appended so one draw covers every KPI value
+        l1_ranges = ((-100.0, -70.0), (8.0, 30.0))
+        self._kpi_names = tuple(name for name, _, _ in kpi_ranges)
+        kpi_lows = np.array([low for _, low, _ in kpi_ranges] + [low for low, _ in l1_ranges], dtype=np.float64)
+        kpi_highs = np.array([high for _, _, high in kpi_ranges] + [high for _, high in l1_ranges], dtype=np.float64)
+        self._kpi_bounds_low = kpi_lows
+        self._kpi_bounds_range = kpi_highs - kpi_lows
+        self._kpi_template = [{'name': name, 'value': 0.0} for name in self._kpi_names]
+
+        # QoE metric ranges: video bitrate (Mbps), packet loss (%), latency (ms), jitter (ms)
+        self._qoe_bounds_low = np.array([2.0, 0.0, 10.0, 1.0], dtype=np.float64)
+        self._qoe_bounds_range = np.array([10.0, 2.0, 100.0, 20.0], dtype=np.float64) - self._qoe_bounds_low
+
+        # Rows of KPI/QoE values drawn a block at a time, refilled when exhausted
+        self._kpi_rows = []
+        self._qoe_rows = []
+
+        # xApp URLs are fixed for the lifetime of the simulator
+        # In Kubernetes, use service name
+        self._urls = {
+            name: f"http://{xapp['host']}:{xapp['port']}{xapp['endpoint']}"
+            for name, xapp in self.config['xapps'].items()
+        }
+        self._batch_urls = {name: f"{url}/batch" for name, url in self._urls.items()}
+
+        # Encoded indications waiting to be sent per xApp (batch mode only)
+        self._buffers = {name: [] for name in self.config['xapps']}
+        self._buffer_lock = threading.Lock()
+
+        # Per-xApp circuit breaker state: consecutive failures and the
+        # monotonic time until which sends are skipped
+        self._breaker = {name: {'fails': 0, 'open_until': 0.0} for name in self.config['xapps']}
+
+        # Long-lived HTTP sessions, one per sending thread, so each xApp
+        # connection is kept alive and reused across iterations instead of
+        # reconnecting on every POST
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+
+        # One worker per xApp so indications are delivered concurrently and a
+        # slow xApp does not stall delivery to the others
+        self._pool = ThreadPoolExecutor(
+            max_workers=len(self.config['xapps']),
+            thread_name_prefix='e2-send'
+        )
+
+    def _session(self) -> requests.Session:
+        """Return the calling thread's pooled HTTP session, creating it on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=len(self.config['xapps']),
+                pool_maxsize=16,
+                # Retry POST on connect errors and 502/503/504 only. A read
+                # error means the xApp may already have the indication, so it
+                # is never re-sent. Exhausted status retries are reported as the
+                # final response instead of raising RetryError.
+                max_retries=Retry(
+                    total=2,
+                    read=False,
+                    backoff_factor=0.1,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset({'POST'}),
+                    raise_on_status=False
+                )
+            )
+            session.mount('http://', adapter)
+            session.headers.update({'Content-Type': 'application/json'})
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _random(self) -> float:
+        """Return the next pre-drawn uniform float in [0, 1)"""
+        if self._random_idx == len(self._random_buf):
+            self._random_buf = self._rng.random(size=len(self._random_buf)).tolist()
+            self._random_idx = 0
+        value = self._random_buf[self._random_idx]
+        self._random_idx += 1
+        return value
+
+    def _uniform(self, low: float, high: float) -> float:
+        """Return a uniform float in [low, high) from the pre-drawn buffer"""
+        return low + (high - low) * self._random()
+
+    def _randbelow(self, n: int) -> int:
+        """Return a uniform int in [0, n) from the pre-drawn buffer"""
+        return int(self._random() * n)
+
+    def _draw_rows(self, low: np.ndarray, value_range: np.ndarray) -> List[List[float]]:
+        """Draw a block of uniform value rows within [low, low + value_range)"""
+        u = self._rng.random((256, low.size))
+        return (low + value_range * u).tolist()
+
+    def _kpi_values(self) -> List[float]:
+        """Return the next pre-drawn row of KPI values"""
+        if not self._kpi_rows:
+            self._kpi_rows = self._draw_rows(self._kpi_bounds_low, self._kpi_bounds_range)
+        return self._kpi_rows.pop()
+
+    def _qoe_values(self) -> List[float]:
+        """Return the next pre-drawn row of QoE values"""
+        if not self._qoe_rows:
+            self._qoe_rows = self._draw_rows(self._qoe_bounds_low, self._qoe_bounds_range)
+        return self._qoe_rows.pop()
+
+    def generate_kpi_indication(self, timestamp: Optional[str] = None,
+                                indication_sn: Optional[int] = None) -> Dict:
+        """Generate E2SM-KPM indication with realistic KPI values including beam_id
+
+        The cell-level measurement dicts are reused by the next call, so the
+        payload must be sent (encoded) before generating another indication.
+        """
+        if timestamp is None or indication_sn is None:
+            now = datetime.now()
+            timestamp = now.isoformat()
+            indication_sn = int(now.timestamp() * 1000)
+
+        cell_id = self._cells[self._randbelow(self._n_cells)]
+        ue_id = self._ue_ids[self._randbelow(self._n_ues)]
 
         # Select a random beam for this UE (SSB Index)
-        beam_id = random.choice(self.beam_config[cell_id])
+        beams = self.beam_config[cell_id]
+        beam_id = beams[self._randbelow(len(beams))]
 
-        # Generate realistic KPI values
-        measurements = [
-            {
-                'name': 'DRB.PacketLossDl',
-                'value': random.uniform(0.1, 5.0)  # 0.1% - 5%
-            },
-            {
-                'name': 'DRB.PacketLossUl',
-                'value': random.uniform(0.1, 5.0)
-            },
-            {
-                'name': 'DRB.UEThpDl',
-                'value': random.uniform(10.0, 100.0)  # 10-100 Mbps
-            },
-            {
-                'name': 'DRB.UEThpUl',
-                'value': random.uniform(5.0, 50.0)   # 5-50 Mbps
-            },
-            {
-                'name': 'RRU.PrbUsedDl',
-                'value': random.uniform(30.0, 85.0)  # 30-85% PRB usage
-            },
-            {
-                'name': 'RRU.PrbUsedUl',
-                'value': random.uniform(20.0, 70.0)
-            },
-            {
-                'name': 'UE.RSRP',
-                'value': random.uniform(-120.0, -80.0)  # -120 to -80 dBm (legacy, cell-level)
-            },
-            {
-                'name': 'UE.RSRQ',
-                'value': random.uniform(-15.0, -5.0)    # -15 to -5 dB
-            },
-            {
-                'name': 'UE.SINR',
-                'value': random.uniform(5.0, 25.0)      # 5-25 dB
-            },
-            {
-                'name': 'RRC.ConnEstabSucc',
-                'value': random.uniform(95.0, 99.9)     # 95-99.9% success rate
-            }
-        ]
+        # Generate realistic KPI values (cell-level KPIs plus serving-beam L1
+        # measurements) from a batched draw
+        values = self._kpi_values()
+        l1_sinr = values.pop()
+        l1_rsrp = values.pop()
+
+        # Only the values change between indications, so update the pooled dicts
+        for measurement, value in zip(self._kpi_template, values):
+            measurement['value'] = value
+        measurements = list(self._kpi_template)
 
         # Add beam-specific measurements (L1-RSRP and L1-SINR per beam)
         # These measurements are critical for beam management in 5G NR
         # L1-RSRP: Layer 1 Reference Signal Received Power (per beam)
         # L1-SINR: Layer 1 Signal-to-Interference-plus-Noise Ratio (per beam)
 
-        # Generate L1-RSRP for the serving beam (typically better than cell RSRP)
-        l1_rsrp = random.uniform(-100.0, -70.0)  # Better range for beam-specific RSRP
         # Add realistic variation based on beam quality
         beam_quality_factor = 1.0 - (beam_id * 0.05)  # Beam 0 is typically best
         l1_rsrp = l1_rsrp * beam_quality_factor
-
-        # Generate L1-SINR for the serving beam
-        l1_sinr = random.uniform(8.0, 30.0)  # Better range for beam-specific SINR
         l1_sinr = l1_sinr * beam_quality_factor
 
         measurements.extend([
@@ -147,53 +278,55 @@ class E2Simulator:
         ])
 
         return {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'cell_id': cell_id,
             'ue_id': ue_id,
             'beam_id': beam_id,  # NEW: SSB Index (0-7)
             'measurements': measurements,
-            'indication_sn': int(time.time() * 1000),
+            'indication_sn': indication_sn,
             'indication_type': 'report'
         }
 
-    def generate_handover_event(self) -> Dict:
+    def generate_handover_event(self, timestamp: Optional[str] = None) -> Dict:
         """Generate handover event for Traffic Steering"""
-        source_cell = random.choice(self.config['cells'])
-        target_cell = random.choice([c for c in self.config['cells'] if c != source_cell])
-        ue_id = f"ue_{random.choice(self.config['ues']):03d}"
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+
+        source_idx = self._randbelow(self._n_cells)
+        source_cell = self._cells[source_idx]
+        # Offset by 1..n-1 so the target is any cell other than the source
+        offset = 1 + self._randbelow(self._n_cells - 1)
+        target_cell = self._cells[(source_idx + offset) % self._n_cells]
+        ue_id = self._ue_ids[self._randbelow(self._n_ues)]
 
         return {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'event_type': 'handover_request',
             'ue_id': ue_id,
             'source_cell': source_cell,
             'target_cell': target_cell,
-            'rsrp': random.uniform(-120.0, -80.0),
-            'rsrq': random.uniform(-15.0, -5.0),
+            'rsrp': self._uniform(-120.0, -80.0),
+            'rsrq': self._uniform(-15.0, -5.0),
             'trigger': 'A3_event'  # Coverage-based handover
         }
 
-    def generate_qoe_metrics(self) -> Dict:
+    def generate_qoe_metrics(self, timestamp: Optional[str] = None) -> Dict:
         """Generate QoE metrics"""
-        ue_id = f"ue_{random.choice(self.config['ues']):03d}"
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
 
-        # Generate QoE metrics
-        video_bitrate = random.uniform(2.0, 10.0)  # Mbps
-        packet_loss = random.uniform(0.0, 2.0)     # %
-        latency = random.uniform(10.0, 100.0)      # ms
-        jitter = random.uniform(1.0, 20.0)         # ms
+        ue_id = self._ue_ids[self._randbelow(self._n_ues)]
+
+        # Generate QoE metrics from a batched draw
+        video_bitrate, packet_loss, latency, jitter = self._qoe_values()
 
         # Calculate QoE score (0-100)
-        qoe_score = 100.0
-        qoe_score -= packet_loss * 5.0  # Penalize packet loss
-        qoe_score -= max(0, (latency - 50.0) / 2.0)  # Penalize high latency
-        qoe_score -= jitter * 2.0  # Penalize jitter
-        qoe_score = max(0.0, min(100.0, qoe_score))
+        qoe_score = calculate_qoe_score(packet_loss, latency, jitter)
 
         return {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'ue_id': ue_id,
-            'cell_id': random.choice(self.config['cells']),
+            'cell_id': self._cells[self._randbelow(self._n_cells)],
             'metrics': {
                 'video_bitrate_mbps': video_bitrate,
                 'packet_loss_percent': packet_loss,
@@ -203,49 +336,131 @@ class E2Simulator:
             }
         }
 
-    def generate_control_event(self) -> Dict:
+    def generate_control_event(self, timestamp: Optional[str] = None) -> Dict:
         """Generate control event for RC xApp"""
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
         return {
-            'timestamp': datetime.now().isoformat(),
-            'cell_id': random.choice(self.config['cells']),
-            'event_type': random.choice(['load_balancing', 'interference_mitigation', 'power_control']),
+            'timestamp': timestamp,
+            'cell_id': self._cells[self._randbelow(self._n_cells)],
+            'event_type': self._control_event_types[self._randbelow(len(self._control_event_types))],
             'trigger_condition': {
-                'prb_usage': random.uniform(70.0, 95.0),
-                'active_ues': random.randint(10, 50)
+                'prb_usage': self._uniform(70.0, 95.0),
+                'active_ues': 10 + self._randbelow(41)  # 10-50
             }
         }
 
     def send_to_xapp(self, xapp_name: str, data: Dict) -> bool:
-        """Send indication to xApp via HTTP"""
-        try:
-            xapp_config = self.config['xapps'].get(xapp_name)
-            if not xapp_config:
-                logger.error(f"Unknown xApp: {xapp_name}")
-                return False
+        """Send indication to xApp via HTTP (queued instead when batch mode is on)"""
+        # orjson emits UTF-8 bytes directly; Content-Type is a session default
+        return self._send_encoded(xapp_name, orjson.dumps(data))
+
+    def _submit(self, xapp_name: str, data: Dict) -> Future:
+        """Encode an indication on the calling thread and send it from the pool"""
+        return self._pool.submit(self._send_encoded, xapp_name, orjson.dumps(data))
+
+    def _send_encoded(self, xapp_name: str, body: bytes) -> bool:
+        """Send an encoded indication to xApp (queued instead when batch mode is on)"""
+        url = self._urls.get(xapp_name)
+        if url is None:
+            logger.error("Unknown xApp: %s", xapp_name)
+            return False
+
+        # Fail fast while the xApp's circuit breaker is open
+        if self._breaker_open(xapp_name):
+            return False
 
-            # In Kubernetes, use service name
-            url = f"http://{xapp_config['host']}:{xapp_config['port']}{xapp_config['endpoint']}"
+        if not self.config['batch_mode']:
+            return self._post(xapp_name, url, body)
 
-            response = requests.post(
+        # Buffer the encoded indication and POST once batch_size are queued
+        with self._buffer_lock:
+            buffer = self._buffers[xapp_name]
+            buffer.append(body)
+            if len(buffer) < self.config['batch_size']:
+                return True
+            self._buffers[xapp_name] = []
+        return self._post(xapp_name, self._batch_urls[xapp_name], self._batch_body(buffer))
+
+    def flush_buffers(self):
+        """Send any indications still queued in batch mode"""
+        with self._buffer_lock:
+            pending = {name: buffer for name, buffer in self._buffers.items() if buffer}
+            self._buffers = {name: [] for name in self.config['xapps']}
+
+        # Flush all xApps concurrently so shutdown takes one POST timeout at
+        # most, well within the pod's termination grace period
+        futures = []
+        for xapp_name, buffer in pending.items():
+            if self._breaker_open(xapp_name):
+                logger.debug("Dropping %d queued indications for %s (circuit open)", len(buffer), xapp_name)
+                continue
+            futures.append(self._pool.submit(
+                self._post, xapp_name, self._batch_urls[xapp_name], self._batch_body(buffer)
+            ))
+        wait(futures)
+
+    @staticmethod
+    def _batch_body(buffer: List[bytes]) -> bytes:
+        """Join encoded indications into a {"batch": [...]} JSON body"""
+        return b'{"batch":[' + b','.join(buffer) + b']}'
+
+    def _post(self, xapp_name: str, url: str, body: bytes) -> bool:
+        """POST an encoded JSON body to an xApp"""
+        try:
+            response = self._session().post(
                 url,
-                json=data,
-                timeout=5,
-                headers={'Content-Type': 'application/json'}
+                data=body,
+                timeout=(1.0, 5.0)  # (connect, read)
             )
 
             if response.status_code == 200:
-                logger.debug(f"Successfully sent data to {xapp_name}")
-                return True
+                logger.debug("Successfully sent data to %s", xapp_name)
+                sent = True
             else:
-                logger.warning(f"Failed to send to {xapp_name}: HTTP {response.status_code}")
-                return False
+                logger.warning("Failed to send to %s: HTTP %d", xapp_name, response.status_code)
+                sent = False
 
-        except requests.exceptions.ConnectionError:
-            logger.debug(f"Connection error for {xapp_name} (xApp may not have REST endpoint yet)")
+        except requests.exceptions.Timeout:
+            logger.warning("Timed out sending to %s", xapp_name)
+            self._record_result(xapp_name, False, timed_out=True)
             return False
+        except requests.exceptions.ConnectionError:
+            logger.debug("Connection error for %s (xApp may not have REST endpoint yet)", xapp_name)
+            sent = False
         except Exception as e:
-            logger.error(f"Error sending to {xapp_name}: {e}")
-            return False
+            logger.error("Error sending to %s: %s", xapp_name, e)
+            sent = False
+
+        self._record_result(xapp_name, sent)
+        return sent
+
+    def _breaker_open(self, xapp_name: str) -> bool:
+        """Check whether sends to the xApp are currently being skipped"""
+        return time.monotonic() < self._breaker[xapp_name]['open_until']
+
+    def _record_result(self, xapp_name: str, sent: bool, timed_out: bool = False):
+        """Update the xApp's circuit breaker after a delivery attempt"""
+        breaker = self._breaker[xapp_name]
+        if sent:
+            breaker['fails'] = 0
+            return
+
+        threshold = self.config['breaker_threshold']
+        breaker['fails'] += 1
+        if timed_out and breaker['fails'] < threshold:
+            # A timed-out send already cost the full timeout, so a hanging xApp
+            # is skipped at once instead of after threshold more timeouts
+            breaker['fails'] = threshold
+            logger.info("Skipping %s for %ss after a timed-out send",
+                        xapp_name, self.config['breaker_cooldown'])
+        elif breaker['fails'] == threshold:
+            logger.info("Skipping %s for %ss after %d consecutive failures",
+                        xapp_name, self.config['breaker_cooldown'], breaker['fails'])
+
+        if breaker['fails'] >= threshold:
+            # Still failing after a cooldown re-opens the breaker right away
+            breaker['open_until'] = time.monotonic() + self.config['breaker_cooldown']
 
     def simulation_loop(self):
         """Main simulation loop"""
@@ -254,32 +469,45 @@ class E2Simulator:
         iteration = 0
         while self.running:
             iteration += 1
-            logger.info(f"=== Simulation Iteration {iteration} ===")
+            logger.info("=== Simulation Iteration %d ===", iteration)
+
+            # All indications in an iteration share one clock reading
+            now = datetime.now()
+            timestamp = now.isoformat()
+            indication_sn = int(now.timestamp() * 1000)
 
             # Generate and send KPI indications to KPIMON
-            kpi_data = self.generate_kpi_indication()
-            self.send_to_xapp('kpimon', kpi_data)
-            logger.info(f"Generated KPI indication for {kpi_data['cell_id']}/{kpi_data['ue_id']} on beam {kpi_data['beam_id']}")
+            kpi_data = self.generate_kpi_indication(timestamp, indication_sn)
+            futures = [self._submit('kpimon', kpi_data)]
+            logger.info("Generated KPI indication for %s/%s on beam %d",
+                        kpi_data['cell_id'], kpi_data['ue_id'], kpi_data['beam_id'])
 
             # Randomly trigger handover events (30% chance)
-            if random.random() < 0.3:
-                ho_event = self.generate_handover_event()
-                self.send_to_xapp('traffic-steering', ho_event)
-                logger.info(f"Generated handover event: {ho_event['source_cell']} -> {ho_event['target_cell']}")
+            if self._random() < 0.3:
+                ho_event = self.generate_handover_event(timestamp)
+                futures.append(self._submit('traffic-steering', ho_event))
+                logger.info("Generated handover event: %s -> %s",
+                            ho_event['source_cell'], ho_event['target_cell'])
 
             # Generate QoE metrics
-            qoe_data = self.generate_qoe_metrics()
-            self.send_to_xapp('qoe-predictor', qoe_data)
-            logger.info(f"Generated QoE metrics for {qoe_data['ue_id']}: QoE={qoe_data['metrics']['qoe_score']:.1f}")
+            qoe_data = self.generate_qoe_metrics(timestamp)
+            futures.append(self._submit('qoe-predictor', qoe_data))
+            logger.info("Generated QoE metrics for %s: QoE=%.1f",
+                        qoe_data['ue_id'], qoe_data['metrics']['qoe_score'])
 
             # Randomly trigger control events (20% chance)
-            if random.random() < 0.2:
-                control_event = self.generate_control_event()
-                self.send_to_xapp('ran-control', control_event)
-                logger.info(f"Generated control event: {control_event['event_type']}")
+            if self._random() < 0.2:
+                control_event = self.generate_control_event(timestamp)
+                futures.append(self._submit('ran-control', control_event))
+                logger.info("Generated control event: %s", control_event['event_type'])
+
+            # Payloads are already encoded, so a slow xApp only delays the next
+            # iteration by this bound; its send keeps running in the pool
+            wait(futures, timeout=5.0)
 
-            logger.info(f"Waiting {self.config['interval']} seconds...")
-            time.sleep(self.config['interval'])
+            logger.info("Waiting %s seconds...", self.config['interval'])
+            if self._stop.wait(self.config['interval']):
+                break
 
     def start(self):
         """Start the simulator"""
@@ -294,23 +522,30 @@ class E2Simulator:
         logger.info(f"  - UEs: {len(self.config['ues'])}")
         logger.info(f"  - Interval: {self.config['interval']}s")
         logger.info(f"  - Target xApps: {', '.join(self.config['xapps'].keys())}")
+        if self.config['batch_mode']:
+            logger.info(f"  - Batch size: {self.config['batch_size']}")
         logger.info("="*60)
 
-        # Start simulation in separate thread
-        sim_thread = threading.Thread(target=self.simulation_loop)
-        sim_thread.daemon = True
-        sim_thread.start()
+        # Stop on Ctrl-C or on pod termination (SIGTERM)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
 
-        # Keep main thread alive
+        # Run the simulation on the main thread until stopped
         try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
+            self.simulation_loop()
+        finally:
             logger.info("Shutting down E2 Simulator...")
-            self.running = False
-            time.sleep(2)
+            self.flush_buffers()
+            self._pool.shutdown(wait=True)
+            for session in self._sessions:
+                session.close()
             logger.info("E2 Simulator stopped")
 
+    def _handle_signal(self, signum, frame):
+        """Stop the simulation loop; it exits at its next wait"""
+        self.running = False
+        self._stop.set()
+
 
 if __name__ == '__main__':
     simulator = E2Simulator()